@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import hashlib
 import io
-import json
 from pathlib import Path
 from typing import Any, Dict
 
+import orjson
 import pandas as pd
 import streamlit as st
 
@@ -25,10 +26,11 @@ LOGGER = get_logger()
 # ---------------------------------------------------------------------
 # Funções auxiliares
 # ---------------------------------------------------------------------
-def _listar_empresas() -> Dict[str, Path]:
-    """Retorna CNPJs disponíveis mapeando para ``contas_config.json``."""
+@st.cache_data(ttl=60, show_spinner=False)
+def _varrer_empresas(data_dir: str) -> Dict[str, Path]:
+    """Varre ``data_dir`` (cacheado por 60 s para evitar I/O a cada rerun)."""
     empresas: Dict[str, Path] = {}
-    for pasta in DATA_DIR.iterdir():
+    for pasta in Path(data_dir).iterdir():
         if pasta.is_dir():
             cfg = pasta / "contas_config.json"
             if cfg.exists():
@@ -36,19 +38,67 @@ def _listar_empresas() -> Dict[str, Path]:
     return empresas
 
 
-def _carregar_config(path: Path) -> Dict[str, Any]:
-    """Lê o JSON de configuração da empresa."""
+def _listar_empresas() -> Dict[str, Path]:
+    """Retorna CNPJs disponíveis mapeando para ``contas_config.json``."""
+    return _varrer_empresas(str(DATA_DIR))
+
+
+@st.cache_data(show_spinner=False)
+def _ler_config(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """Lê o JSON; ``mtime_ns`` invalida o cache quando o arquivo muda."""
+    return orjson.loads(Path(path_str).read_bytes())
+
+
+def _carregar_config(path: Path) -> tuple[Dict[str, Any], int]:
+    """Lê o JSON de configuração da empresa.
+
+    Retorna também o ``mtime_ns`` lido, para os demais caches da página
+    não repetirem o ``stat``. Se o arquivo sumiu ou não pôde ser lido,
+    devolve ``({}, 0)``.
+    """
     try:
-        with path.open(encoding="utf-8") as fp:
-            return json.load(fp)
-    except Exception as exc:  # pragma: no cover
+        mtime_ns = path.stat().st_mtime_ns
+        return _ler_config(str(path), mtime_ns), mtime_ns
+    except Exception as exc:
         LOGGER.error("Erro ao carregar config %s: %s", path, exc)
-        return {}
+        return {}, 0
+
+
+@st.cache_data(show_spinner="Lendo extrato...")
+def _ler_extrato(nome: str, digest: str, _conteudo: bytes) -> pd.DataFrame:
+    """Lê o extrato enviado; cacheado por nome + hash do conteúdo."""
+    return read_extrato(io.BytesIO(_conteudo))
+
+
+@st.cache_data(show_spinner="Lendo lançamentos...")
+def _ler_lancamentos(nome: str, digest: str, _conteudo: bytes) -> pd.DataFrame:
+    """Lê a planilha de lançamentos; cacheada por nome + hash do conteúdo."""
+    return read_lancamentos(io.BytesIO(_conteudo))
+
+
+def _digest(conteudo: bytes) -> str:
+    """Hash curto usado como chave de cache no lugar dos bytes do arquivo."""
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+@st.cache_data(show_spinner=False)
+def _indice_fornecedores(
+    cnpj: str, mtime_ns: int, _fornecedores: Dict[str, int]
+) -> tuple[pd.DataFrame, pd.Series]:
+    """Tabela de fornecedores e nomes em minúsculas para a busca.
+
+    Cacheada por CNPJ + data de modificação do JSON.
+    """
+    df = pd.DataFrame(
+        list(_fornecedores.items()),
+        columns=["Fornecedor", "Código da Conta"],
+    )
+    return df, df["Fornecedor"].str.lower()
 
 
 def _validar_colunas(df: pd.DataFrame, colunas: list[str]) -> bool:
     """Verifica se todas as colunas estão presentes no DataFrame."""
-    return all(col in df.columns for col in colunas)
+    return set(colunas).issubset(df.columns)
 
 
 def _mostrar_dataframe(df: pd.DataFrame, titulo: str) -> None:
@@ -76,7 +126,7 @@ def main() -> None:
         st.info("Escolha uma empresa para iniciar.")
         return
 
-    config = _carregar_config(empresas[cnpj])
+    config, config_mtime_ns = _carregar_config(empresas[cnpj])
 
     # -----------------------------------------------------------------
     # 2) Informações da empresa
@@ -88,15 +138,15 @@ def main() -> None:
         "Utilize a busca para localizar fornecedores."
     )
 
-    fornecedores = pd.DataFrame(
-        list(config.get("fornecedores", {}).items()),
-        columns=["Fornecedor", "Código da Conta"],
+    fornecedores, nomes = _indice_fornecedores(
+        cnpj,
+        config_mtime_ns,
+        config.get("fornecedores", {}),
     )
     filtro = st.text_input("Pesquisar fornecedor")
     if filtro:
-        fornecedores = fornecedores[
-            fornecedores["Fornecedor"].str.contains(filtro, case=False)
-        ]
+        mascara = nomes.str.contains(filtro.lower(), regex=False)
+        fornecedores = fornecedores[mascara.to_numpy()]
     st.dataframe(fornecedores)
 
     # -----------------------------------------------------------------
@@ -148,8 +198,14 @@ def main() -> None:
             # ----------------------------------------------------------
             # Leitura dos dados
             # ----------------------------------------------------------
-            df_extrato = read_extrato(extrato_file)
-            df_lanc = read_lancamentos(lanc_file)
+            extrato_bytes = extrato_file.getvalue()
+            df_extrato = _ler_extrato(
+                extrato_file.name, _digest(extrato_bytes), extrato_bytes
+            )
+            lanc_bytes = lanc_file.getvalue()
+            df_lanc = _ler_lancamentos(
+                lanc_file.name, _digest(lanc_bytes), lanc_bytes
+            )
 
             # ----------------------------------------------------------
             # Validações
@@ -192,14 +248,16 @@ def main() -> None:
             # ----------------------------------------------------------
             # Exportar CSV
             # ----------------------------------------------------------
-            csv_data = export_df.to_csv(
+            csv_buffer = io.BytesIO()
+            export_df.to_csv(
+                csv_buffer,
                 sep=";",
                 index=False,
                 encoding="utf-8-sig",
-            ).encode("utf-8-sig")
+            )
             st.download_button(
                 "Baixar CSV",
-                data=csv_data,
+                data=csv_buffer,
                 file_name=f"conciliacao_{cnpj}.csv",
                 mime="text/csv",
             )
@@ -213,7 +271,7 @@ def main() -> None:
 
             st.download_button(
                 "Baixar Excel",
-                data=buffer.getvalue(),
+                data=buffer,
                 file_name=f"conciliacao_{cnpj}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             )
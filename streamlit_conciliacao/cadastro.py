@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
-import json
+import copy
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator, Mapping
+
+import orjson
 
 # Diretório base para os dados
 DATA_DIR = Path(__file__).resolve().parents[1] / "data"
@@ -36,22 +40,33 @@ def load_cadastros(cnpj: str) -> dict:
     """Carrega o JSON da empresa. Se não existir, cria estrutura padrão."""
     json_path = _get_json_path(cnpj)
     if not json_path.exists():
-        data: dict = DEFAULT_CADASTRO.copy()
+        data: dict = copy.deepcopy(DEFAULT_CADASTRO)
         save_cadastros(cnpj, data)
         return data
-    with json_path.open(encoding="utf-8") as fp:
-        return json.load(fp)
+    return orjson.loads(json_path.read_bytes())
 
 
 def save_cadastros(cnpj: str, data: dict) -> None:
-    """Salva (indentado=2, ensure_ascii=False) o JSON da empresa."""
+    """Salva (indentado=2, UTF-8 sem escapes) o JSON da empresa."""
     json_path = _get_json_path(cnpj)
     tmp_path = json_path.with_suffix(".tmp")
-    with tmp_path.open("w", encoding="utf-8") as fp:
-        json.dump(data, fp, indent=2, ensure_ascii=False)
+    tmp_path.write_bytes(
+        orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    )
     tmp_path.replace(json_path)
 
 
+@contextmanager
+def edit_cadastros(cnpj: str) -> Iterator[dict]:
+    """Carrega o JSON uma vez e salva ao sair do bloco ``with``.
+
+    Se o bloco levantar exceção, nada é gravado.
+    """
+    data = load_cadastros(cnpj)
+    yield data
+    save_cadastros(cnpj, data)
+
+
 def _validar_categoria(categoria: str) -> None:
     if categoria not in VALID_CATEGORIAS:
         raise ValueError(f"Categoria inválida: {categoria}")
@@ -60,29 +75,33 @@ def _validar_categoria(categoria: str) -> None:
 def add_item(cnpj: str, categoria: str, chave: str, valor: int) -> None:
     """Adiciona um item à categoria especificada."""
     _validar_categoria(categoria)
-    data = load_cadastros(cnpj)
-    data[categoria][chave] = valor
-    save_cadastros(cnpj, data)
+    with edit_cadastros(cnpj) as data:
+        data[categoria][chave] = valor
+
+
+def add_items_bulk(cnpj: str, categoria: str, itens: Mapping[str, int]) -> None:
+    """Adiciona vários itens à categoria com uma única gravação."""
+    _validar_categoria(categoria)
+    with edit_cadastros(cnpj) as data:
+        data[categoria].update(itens)
 
 
 def edit_item(cnpj: str, categoria: str, chave: str, novo_valor: int) -> None:
     """Edita um item existente na categoria."""
     _validar_categoria(categoria)
-    data = load_cadastros(cnpj)
-    if chave not in data[categoria]:
-        raise KeyError(chave)
-    data[categoria][chave] = novo_valor
-    save_cadastros(cnpj, data)
+    with edit_cadastros(cnpj) as data:
+        if chave not in data[categoria]:
+            raise KeyError(chave)
+        data[categoria][chave] = novo_valor
 
 
 def delete_item(cnpj: str, categoria: str, chave: str) -> None:
     """Remove um item da categoria."""
     _validar_categoria(categoria)
-    data = load_cadastros(cnpj)
-    if chave not in data[categoria]:
-        raise KeyError(chave)
-    del data[categoria][chave]
-    save_cadastros(cnpj, data)
+    with edit_cadastros(cnpj) as data:
+        if chave not in data[categoria]:
+            raise KeyError(chave)
+        del data[categoria][chave]
 
 
 def add_fornecedor(cnpj: str, nome: str, codigo: int) -> None:
@@ -104,6 +123,5 @@ def set_conta_especial(cnpj: str, campo: str, codigo: int) -> None:
     """Define o código de conta para campos especiais."""
     if campo not in VALID_CAMPOS_ESPECIAIS:
         raise ValueError(f"Campo inválido: {campo}")
-    data = load_cadastros(cnpj)
-    data[campo] = codigo
-    save_cadastros(cnpj, data)
+    with edit_cadastros(cnpj) as data:
+        data[campo] = codigo
@@ -5,6 +5,7 @@ from __future__ import annotations
 import re
 from typing import Any, List, Optional
 
+import numpy as np
 import pandas as pd
 
 # --------------------------------------------------------------------------
@@ -16,31 +17,59 @@ COD_HISTORICO_PAGAMENTO = 34
 COD_HISTORICO_PAG_CAIXA = 1
 COD_HISTORICO_DEPOSITO = 9
 
+_NOTA_RE = re.compile(r"\D")
+
 
 # --------------------------------------------------------------------------
 # Utilidades de formatação e parsing
 # --------------------------------------------------------------------------
-def _parse_valor_extrato(valor: Any) -> tuple[float, str]:
-    """Converte valor do extrato (ex.: '123,00D') em (valor, tipo)."""
-    s = str(valor).strip()
-    tipo = s[-1].upper()
-    numero = s[:-1].replace(".", "").replace(",", ".")
-    return float(numero), tipo
+def _parse_texto_brl(textos: pd.Series) -> np.ndarray:
+    """Converte textos no formato brasileiro ('1.234,56') em float."""
+    s = textos.astype("string").str.strip()
+    s = s.mask(s.isna() | (s == "") | (s.str.lower() == "nan"), "0")
+    return (
+        s.str.replace(".", "", regex=False)
+        .str.replace(",", ".", regex=False)
+        .to_numpy(dtype="float64")
+    )
 
 
-def _parse_valor(valor: Any) -> float:
-    """
-    Converte valor brasileiro ('1.234,56') para float.
+def _parse_valor_series(valores: pd.Series) -> pd.Series:
+    """Converte uma coluna de valores brasileiros ('1.234,56') para float.
 
-    Aceita strings vazias, ``None`` ou ``NaN`` e devolve 0.0 para
-    evitar propagação de valores ausentes nas validações.
+    Vazios, ``None`` e ``NaN`` viram 0.0 para evitar propagação de valores
+    ausentes nas validações. Colunas ``object`` podem misturar células
+    numéricas e de texto: só os elementos ``str`` passam pelo parsing
+    brasileiro; os demais são números e vão por ``pd.to_numeric`` (100.5
+    não pode virar '100.5' e, sem o ponto, 1005.0).
     """
-    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
-        return 0.0
-    s = str(valor).strip()
-    if not s or s.lower() == "nan":
-        return 0.0
-    return float(s.replace(".", "").replace(",", "."))
+    if pd.api.types.is_numeric_dtype(valores):
+        return valores.astype("float64").fillna(0.0)
+    if valores.dtype != object:  # coluna só de texto (str/string)
+        return pd.Series(_parse_texto_brl(valores), index=valores.index)
+    eh_texto = np.fromiter(
+        (isinstance(v, str) for v in valores), dtype=bool, count=len(valores)
+    )
+    resultado = np.empty(len(valores), dtype="float64")
+    resultado[eh_texto] = _parse_texto_brl(valores[eh_texto])
+    resultado[~eh_texto] = pd.to_numeric(valores[~eh_texto]).to_numpy(
+        dtype="float64", na_value=np.nan
+    )
+    return pd.Series(resultado, index=valores.index).fillna(0.0)
+
+
+def _parse_valor_extrato_series(valores: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Converte valores do extrato (ex.: '123,00D') em (valores, tipos)."""
+    s = valores.astype("string").str.strip()
+    numero = s.str[:-1].str.replace(".", "", regex=False).str.replace(
+        ",", ".", regex=False
+    )
+    return numero.astype("float64"), s.str[-1].str.upper()
+
+
+def _centavos(valores: pd.Series) -> np.ndarray:
+    """Converte valores em reais para centavos inteiros (chave exata de match)."""
+    return np.rint(valores.to_numpy(dtype="float64") * 100).astype(np.int64)
 
 
 def _fmt_valor(valor: float) -> str:
@@ -48,9 +77,28 @@ def _fmt_valor(valor: float) -> str:
     return f"{valor:.2f}".replace(".", ",")
 
 
-def _fmt_data(data: Any) -> str:
-    """Formata datas para dd/mm/aaaa."""
-    return pd.to_datetime(data, dayfirst=True).strftime("%d/%m/%Y")
+def _fmt_valor_series(valores: pd.Series) -> pd.Series:
+    """Versão vetorizada de :func:`_fmt_valor` (um format por valor distinto)."""
+    unicos = pd.unique(valores)
+    return valores.map(dict(zip(unicos, map(_fmt_valor, unicos))))
+
+
+def _fmt_data_series(datas: pd.Series) -> pd.Series:
+    """Formata uma coluna de datas como dd/mm/aaaa.
+
+    O formato é inferido pelo primeiro elemento; se a coluna misturar
+    formatos, cada data é interpretada individualmente. Datas vazias ou
+    inválidas geram ``ValueError``.
+    """
+    try:
+        convertidas = pd.to_datetime(datas, dayfirst=True, cache=True)
+    except ValueError:
+        convertidas = pd.to_datetime(datas, dayfirst=True, format="mixed")
+    vazias = convertidas.isna()
+    if vazias.any():
+        linhas = ", ".join(map(str, datas.index[vazias][:5]))
+        raise ValueError(f"Data vazia ou inválida em '{datas.name}' (linhas {linhas})")
+    return convertidas.dt.strftime("%d/%m/%Y")
 
 
 def _get_primeira_conta(contas: dict) -> int:
@@ -58,59 +106,169 @@ def _get_primeira_conta(contas: dict) -> int:
     return next(iter(contas.values()), 0)
 
 
-def _clean_nota(nota: Any) -> str:
-    """Remove caracteres não numéricos da nota fiscal."""
-    return re.sub(r"\D", "", str(nota))
+def _contas_fornecedor(nomes: pd.Series, fornecedores: dict) -> np.ndarray:
+    """
+    Resolve a conta de cada fornecedor consultando o dicionário uma vez por
+    nome distinto e indexando o resultado pelos códigos da categoria.
+    """
+    categoria = nomes.astype("category")
+    lookup = np.array(
+        [
+            fornecedores.get(nome, CONTA_FORNECEDOR_PADRAO)
+            for nome in categoria.cat.categories
+        ]
+        # código -1 (nome ausente) cai na última posição: conta padrão
+        + [CONTA_FORNECEDOR_PADRAO],
+        dtype=np.int64,
+    )
+    return lookup[categoria.cat.codes.to_numpy()]
 
 
 # --------------------------------------------------------------------------
 # Funções auxiliares para montar as partidas contábeis
 # --------------------------------------------------------------------------
-def _adicionar_linha(
-    rows: List[dict],
+_COLUNAS_RESULTADO = [
+    "Data",
+    "Cod Conta Débito",
+    "Cod Conta Crédito",
+    "Valor",
+    "Cod Histórico",
+    "Complemento",
+    "Inicia Lote",
+    "_tipo",
+]
+# Colunas de texto do resultado, guardadas em Arrow (menos memória, CSV mais rápido)
+_COLUNAS_TEXTO = ["Data", "Valor", "Complemento", "Inicia Lote"]
+_DTYPES_TEXTO = dict.fromkeys(_COLUNAS_TEXTO, "string[pyarrow]")
+
+
+def _resultado_vazio() -> pd.DataFrame:
+    """Resultado sem linhas, com as mesmas colunas e tipos do caso normal."""
+    return pd.DataFrame(columns=_COLUNAS_RESULTADO).astype(_DTYPES_TEXTO)
+
+
+def _linhas(
+    lote: pd.Series,
+    seq: int,
     *,
-    data: str,
-    valor: float,
+    data: Any,
+    valor: Any,
     hist: int,
-    complemento: str,
+    complemento: Any,
     tipo: str,
-    debito: Optional[int] = None,
-    credito: Optional[int] = None,
-) -> None:
-    """Adiciona uma linha (débito/crédito) ao resultado."""
-    if debito and credito:
-        raise ValueError("Linha não pode conter débito e crédito simultâneos")
-
-    rows.append(
+    debito: Any = 0,
+    credito: Any = 0,
+) -> pd.DataFrame:
+    """
+    Monta um conjunto de linhas (débito ou crédito), uma por lote.
+
+    ``lote`` identifica o bloco de cada linha e ``seq`` a posição da linha
+    dentro do bloco; os demais campos aceitam escalares ou ``Series``
+    alinhadas a ``lote``.
+    """
+    return pd.DataFrame(
         {
+            "_lote": lote,
+            "_seq": seq,
             "Data": data,
-            "Cod Conta Débito": debito or "",
-            "Cod Conta Crédito": credito or "",
-            "Valor": _fmt_valor(valor),
+            "_debito": debito,
+            "_credito": credito,
+            "_valor": valor,
             "Cod Histórico": hist,
             "Complemento": complemento,
-            "Inicia Lote": "",
             "_tipo": tipo,
         }
     )
 
 
-def _marca_lote(rows: List[dict]) -> None:
-    """Define a primeira linha do lote com 'Inicia Lote' = 1."""
-    if rows:
-        rows[0]["Inicia Lote"] = "1"
+def _partidas_lancamentos(
+    lanc: pd.DataFrame,
+    *,
+    hist: int,
+    conta_credito: int,
+    valor_credito: pd.Series,
+    tipo: str,
+    conta_multa: int,
+    conta_tarifa: int,
+    conta_desconto: int,
+) -> List[pd.DataFrame]:
+    """
+    Gera as partidas de pagamento (simples ou composto) dos lançamentos.
+
+    O lançamento simples tem 2 linhas (fornecedor / ``conta_credito``); o
+    composto acrescenta multa, tarifa e desconto entre elas. Usa as máscaras
+    ``_tem_multa``/``_tem_tarifa``/``_tem_desconto``/``_extras`` de ``lanc``.
+    """
+    extras = lanc["_extras"]
+
+    partes = [
+        _linhas(
+            lanc["_lote"],
+            0,
+            data=lanc["_data"],
+            valor=lanc["_valor_nota"].where(extras, lanc["_valor_pagar"]),
+            hist=hist,
+            complemento=lanc["_complemento"],
+            debito=lanc["_conta_forn"],
+            tipo=tipo,
+        )
+    ]
+    adicionais = (
+        ("_multa", "debito", conta_multa),
+        ("_tarifa", "debito", conta_tarifa),
+        ("_desconto", "credito", conta_desconto),
+    )
+    for seq, (coluna, lado, conta) in enumerate(adicionais, start=1):
+        sub = lanc[lanc[f"_tem{coluna}"]]
+        partes.append(
+            _linhas(
+                sub["_lote"],
+                seq,
+                data=sub["_data"],
+                valor=sub[coluna],
+                hist=COD_HISTORICO_PAGAMENTO,
+                complemento=sub["_complemento"],
+                tipo=tipo,
+                **{lado: conta},
+            )
+        )
+    partes.append(
+        _linhas(
+            lanc["_lote"],
+            len(adicionais) + 1,
+            data=lanc["_data"],
+            valor=valor_credito,
+            hist=hist,
+            complemento=lanc["_complemento"],
+            credito=conta_credito,
+            tipo=tipo,
+        )
+    )
+    return partes
 
 
-def _balance_check(rows: List[dict]) -> None:
-    """Valida se débitos = créditos no bloco atual."""
-    total_deb = sum(_parse_valor(r["Valor"]) for r in rows if r["Cod Conta Débito"])
-    total_cred = sum(_parse_valor(r["Valor"]) for r in rows if r["Cod Conta Crédito"])
-    if round(total_deb - total_cred, 2) != 0:
+def _balance_check(linhas: pd.DataFrame) -> None:
+    """Valida se débitos = créditos em cada lote."""
+    valor = linhas["_valor"].round(2)
+    totais = pd.DataFrame(
+        {
+            "debito": valor.where(linhas["_debito"].astype(bool), 0.0),
+            "credito": valor.where(linhas["_credito"].astype(bool), 0.0),
+        }
+    ).groupby(linhas["_lote"]).sum()
+    abertos = totais[(totais["debito"] - totais["credito"]).round(2) != 0]
+    if not abertos.empty:
+        total_deb, total_cred = abertos.iloc[0]
         raise ValueError(
             f"Partidas não fecham: débitos {total_deb} != créditos {total_cred}"
         )
 
 
+def _fmt_conta(contas: pd.Series) -> pd.Series:
+    """Substitui contas ausentes (0/None) por string vazia."""
+    return contas.where(contas.astype(bool), "")
+
+
 # --------------------------------------------------------------------------
 # Função principal de conciliação
 # --------------------------------------------------------------------------
@@ -119,6 +277,7 @@ def conciliar(
     df_lancamentos: pd.DataFrame,
     config: dict,
     conta_banco: Optional[int] = None,
+    validate: bool = True,
 ) -> pd.DataFrame:
     """
     Concilia extrato bancário (saídas “D”) com planilha de lançamentos.
@@ -134,7 +293,13 @@ def conciliar(
     conta_banco : int, opcional
         Código da conta bancária a creditar. Se omitido, usa a primeira conta
         de config['contas_pagamento'].
+    validate : bool, padrão True
+        Verifica se débitos = créditos em cada lote (``ValueError`` se não
+        fecharem). Pode ser desligado para planilhas já validadas.
     """
+    if df_extrato.empty and df_lancamentos.empty:
+        return _resultado_vazio()
+
     # ------------------------------------------------------------------
     # Configuração de contas
     # ------------------------------------------------------------------
@@ -144,292 +309,203 @@ def conciliar(
     conta_multa = config.get("multas_juros", 0)
     conta_desconto = config.get("descontos", 0)
     conta_tarifa = config.get("tarifas", 316)
+    fornecedores_map = config.get("fornecedores", {})
+    clientes_map = config.get("clientes", {})
 
     # ------------------------------------------------------------------
     # Pré‑processamento da planilha de lançamentos
     # ------------------------------------------------------------------
-    lanc = df_lancamentos.copy()
-    lanc["_valor_nota"] = lanc["Valor"].apply(_parse_valor)
-    lanc["_valor_pagar"] = lanc["Valor a pagar"].apply(_parse_valor)
-    lanc["_multa"] = lanc["Multa e juros"].apply(_parse_valor)
-    lanc["_desconto"] = lanc["Descontos"].apply(_parse_valor)
-    lanc["_tarifa"] = lanc["Tarifas de Boleto"].apply(_parse_valor)
-    lanc["_data"] = lanc["Data pagamento"].apply(_fmt_data)
-    lanc["_matched"] = False
+    # Só as colunas derivadas são montadas (sem copiar a planilha inteira)
+    nomes = df_lancamentos["Nome do fornecedor"]
+    notas = (
+        df_lancamentos["Nota fiscal"]
+        .astype("string")
+        .fillna("")
+        .str.replace(_NOTA_RE, "", regex=True)
+    )
+    lanc = pd.DataFrame(
+        {
+            "_valor_nota": _parse_valor_series(df_lancamentos["Valor"]),
+            "_valor_pagar": _parse_valor_series(df_lancamentos["Valor a pagar"]),
+            "_multa": _parse_valor_series(df_lancamentos["Multa e juros"]),
+            "_desconto": _parse_valor_series(df_lancamentos["Descontos"]),
+            "_tarifa": _parse_valor_series(df_lancamentos["Tarifas de Boleto"]),
+            "_data": _fmt_data_series(df_lancamentos["Data pagamento"]),
+            "_conta_forn": _contas_fornecedor(nomes, fornecedores_map),
+            "_complemento": (
+                notas + " " + nomes.astype("string").fillna("")
+            ).str.strip(),
+        }
+    )
+    # Máscaras dos adicionais, calculadas uma única vez
+    lanc["_tem_multa"] = lanc["_multa"] > 0
+    lanc["_tem_tarifa"] = lanc["_tarifa"] > 0
+    lanc["_tem_desconto"] = lanc["_desconto"] > 0
+    lanc["_extras"] = lanc["_tem_multa"] | lanc["_tem_tarifa"] | lanc["_tem_desconto"]
+
+    # ------------------------------------------------------------------
+    # Pré‑processamento do extrato
+    # ------------------------------------------------------------------
+    if df_extrato.empty:
+        # Extrato vazio (até sem colunas): tudo da planilha vai para caixa
+        ext = pd.DataFrame(
+            {
+                "_lote": np.empty(0, dtype=np.int64),
+                "_data": np.empty(0, dtype=object),
+                "_valor": np.empty(0, dtype="float64"),
+                "_tipo_mov": np.empty(0, dtype=object),
+                "_cliente": np.empty(0, dtype=object),
+            }
+        )
+    else:
+        valores, tipos = _parse_valor_extrato_series(df_extrato["Valor"])
+        ext = pd.DataFrame(
+            {
+                "_lote": range(len(df_extrato)),
+                "_data": _fmt_data_series(df_extrato["Data"]).to_numpy(
+                    dtype=object
+                ),
+                "_valor": valores.to_numpy(dtype="float64"),
+                "_tipo_mov": tipos.to_numpy(dtype=object),
+                "_cliente": df_extrato.get(
+                    "Histórico", pd.Series("", index=df_extrato.index)
+                )
+                .astype(str)
+                .to_numpy(),
+            }
+        )
 
-    resultado: List[dict] = []
+    partes: List[pd.DataFrame] = []
 
     # ------------------------------------------------------------------
-    # 1) Percorrer o extrato e casar cada saída 'D' (e tratar créditos 'C')
+    # 1) Entradas (C) – depósito / PIX recebido
     # ------------------------------------------------------------------
-    for _, ext in df_extrato.iterrows():
-        valor, tipo = _parse_valor_extrato(ext["Valor"])
-        data = _fmt_data(ext["Data"])
-
-        # Entradas (C) – depósito / PIX recebido
-        if tipo == "C":
-            linhas: List[dict] = []
-            cliente = str(ext.get("Histórico", ""))
-            conta_cli = config.get("clientes", {}).get(cliente, CONTA_CAIXA)
-
-            _adicionar_linha(
-                linhas,
-                data=data,
-                valor=valor,
-                hist=COD_HISTORICO_DEPOSITO,
-                complemento="",
-                debito=banco_conta,
-                tipo="Entrada",
-            )
-            _adicionar_linha(
-                linhas,
-                data=data,
-                valor=valor,
+    entradas = ext[ext["_tipo_mov"] == "C"]
+    conta_cli = (
+        entradas["_cliente"].map(clientes_map).fillna(CONTA_CAIXA).astype("int64")
+    )
+    for seq, lado, conta in ((0, "debito", banco_conta), (1, "credito", conta_cli)):
+        partes.append(
+            _linhas(
+                entradas["_lote"],
+                seq,
+                data=entradas["_data"],
+                valor=entradas["_valor"],
                 hist=COD_HISTORICO_DEPOSITO,
                 complemento="",
-                credito=conta_cli,
                 tipo="Entrada",
+                **{lado: conta},
             )
-            _marca_lote(linhas)
-            _balance_check(linhas)
-            resultado.extend(linhas)
-            continue  # próximo movimento
-
-        # Se não for débito, ignora
-        if tipo != "D":
-            continue
-
-        # Tenta casar com planilha
-        possiveis = lanc[
-            (lanc["_data"] == data)
-            & (lanc["_valor_pagar"] == valor)
-            & (~lanc["_matched"])
-        ]
-
-        # ------------------------------------------------------------------
-        # 1.a) Encontrou match na planilha
-        # ------------------------------------------------------------------
-        if not possiveis.empty:
-            idx = possiveis.index[0]
-            row = lanc.loc[idx]
-            lanc.at[idx, "_matched"] = True
-
-            fornecedor = row["Nome do fornecedor"]
-            conta_forn = config.get("fornecedores", {}).get(
-                fornecedor, CONTA_FORNECEDOR_PADRAO
-            )
-            nota = _clean_nota(row["Nota fiscal"])
-            compl = f"{nota} {fornecedor}".strip()
-
-            linhas: List[dict] = []
-            extras = (
-                row["_multa"] > 0 or row["_desconto"] > 0 or row["_tarifa"] > 0
-            )
+        )
 
-            if not extras:
-                # Lançamento simples (2 linhas)
-                _adicionar_linha(
-                    linhas,
-                    data=data,
-                    valor=row["_valor_pagar"],
-                    hist=COD_HISTORICO_PAGAMENTO,
-                    complemento=compl,
-                    debito=conta_forn,
-                    tipo="Banco",
-                )
-                _adicionar_linha(
-                    linhas,
-                    data=data,
-                    valor=row["_valor_pagar"],
-                    hist=COD_HISTORICO_PAGAMENTO,
-                    complemento=compl,
-                    credito=banco_conta,
-                    tipo="Banco",
-                )
-            else:
-                # Lançamento composto
-                _adicionar_linha(
-                    linhas,
-                    data=data,
-                    valor=row["_valor_nota"],
-                    hist=COD_HISTORICO_PAGAMENTO,
-                    complemento=compl,
-                    debito=conta_forn,
-                    tipo="Banco",
-                )
-                if row["_multa"] > 0:
-                    _adicionar_linha(
-                        linhas,
-                        data=data,
-                        valor=row["_multa"],
-                        hist=COD_HISTORICO_PAGAMENTO,
-                        complemento=compl,
-                        debito=conta_multa,
-                        tipo="Banco",
-                    )
-                if row["_tarifa"] > 0:
-                    _adicionar_linha(
-                        linhas,
-                        data=data,
-                        valor=row["_tarifa"],
-                        hist=COD_HISTORICO_PAGAMENTO,
-                        complemento=compl,
-                        debito=conta_tarifa,
-                        tipo="Banco",
-                    )
-                if row["_desconto"] > 0:
-                    _adicionar_linha(
-                        linhas,
-                        data=data,
-                        valor=row["_desconto"],
-                        hist=COD_HISTORICO_PAGAMENTO,
-                        complemento=compl,
-                        credito=conta_desconto,
-                        tipo="Banco",
-                    )
-                _adicionar_linha(
-                    linhas,
-                    data=data,
-                    valor=valor,
-                    hist=COD_HISTORICO_PAGAMENTO,
-                    complemento=compl,
-                    credito=banco_conta,
-                    tipo="Banco",
-                )
+    # ------------------------------------------------------------------
+    # 2) Casar cada saída 'D' com a planilha por data+valor
+    # ------------------------------------------------------------------
+    # A n‑ésima saída com a mesma (data, valor) casa com o n‑ésimo
+    # lançamento dessa chave, respeitando a ordem da planilha.
+    chave = ["_data", "_centavos"]
+    saidas = ext[ext["_tipo_mov"] == "D"]
+    # Centavos só das saídas: linhas em branco do extrato (valor NaN) não
+    # entram no merge nem no cast para inteiro
+    saidas = saidas.assign(_centavos=_centavos(saidas["_valor"]))
+    saidas = saidas.assign(_ocorrencia=saidas.groupby(chave).cumcount())
+    lanc_chaves = pd.DataFrame(
+        {
+            "_data": lanc["_data"].to_numpy(),
+            "_centavos": _centavos(lanc["_valor_pagar"]),
+            "_pos": range(len(lanc)),
+        }
+    )
+    lanc_chaves["_ocorrencia"] = lanc_chaves.groupby(chave).cumcount()
+    casados = saidas.merge(
+        lanc_chaves,
+        on=[*chave, "_ocorrencia"],
+        how="left",
+        validate="one_to_one",
+    )
+    com_match = casados["_pos"].notna()
+
+    # 2.a) Encontrou match na planilha
+    pares = casados[com_match]
+    pos_casados = pares["_pos"].to_numpy(dtype=np.int64)
+    casado = np.zeros(len(lanc), dtype=bool)
+    casado[pos_casados] = True
+    banco = lanc.iloc[pos_casados].assign(_lote=pares["_lote"].to_numpy())
+    partes.extend(
+        _partidas_lancamentos(
+            banco,
+            hist=COD_HISTORICO_PAGAMENTO,
+            conta_credito=banco_conta,
+            valor_credito=banco["_valor_pagar"],
+            tipo="Banco",
+            conta_multa=conta_multa,
+            conta_tarifa=conta_tarifa,
+            conta_desconto=conta_desconto,
+        )
+    )
 
-            _marca_lote(linhas)
-            _balance_check(linhas)
-            resultado.extend(linhas)
-
-        # ------------------------------------------------------------------
-        # 1.b) Sem match → usa conta padrão
-        # ------------------------------------------------------------------
-        else:
-            linhas: List[dict] = []
-            _adicionar_linha(
-                linhas,
-                data=data,
-                valor=valor,
-                hist=COD_HISTORICO_PAGAMENTO,
-                complemento="",
-                debito=CONTA_FORNECEDOR_PADRAO,
-                tipo="Extrato",
-            )
-            _adicionar_linha(
-                linhas,
-                data=data,
-                valor=valor,
+    # 2.b) Sem match → usa conta padrão
+    sem_match = casados[~com_match]
+    for seq, lado, conta in (
+        (0, "debito", CONTA_FORNECEDOR_PADRAO),
+        (1, "credito", banco_conta),
+    ):
+        partes.append(
+            _linhas(
+                sem_match["_lote"],
+                seq,
+                data=sem_match["_data"],
+                valor=sem_match["_valor"],
                 hist=COD_HISTORICO_PAGAMENTO,
                 complemento="",
-                credito=banco_conta,
                 tipo="Extrato",
+                **{lado: conta},
             )
-            _marca_lote(linhas)
-            _balance_check(linhas)
-            resultado.extend(linhas)
+        )
 
     # ------------------------------------------------------------------
-    # 2) Lançamentos não conciliados → pagamento em caixa
+    # 3) Lançamentos não conciliados → pagamento em caixa
     # ------------------------------------------------------------------
-    restantes = lanc[~lanc["_matched"]]
-    for _, row in restantes.iterrows():
-        data = row["_data"]
-        fornecedor = row["Nome do fornecedor"]
-        conta_forn = config.get("fornecedores", {}).get(
-            fornecedor, CONTA_FORNECEDOR_PADRAO
-        )
-        nota = _clean_nota(row["Nota fiscal"])
-        compl = f"{nota} {fornecedor}".strip()
-
-        linhas: List[dict] = []
-        extras = (
-            row["_multa"] > 0 or row["_desconto"] > 0 or row["_tarifa"] > 0
+    restantes = lanc[~casado].assign(_lote=len(ext) + np.flatnonzero(~casado))
+    partes.extend(
+        _partidas_lancamentos(
+            restantes,
+            hist=COD_HISTORICO_PAG_CAIXA,
+            conta_credito=CONTA_CAIXA,
+            valor_credito=(restantes["_valor_pagar"] + restantes["_tarifa"]).where(
+                restantes["_extras"], restantes["_valor_pagar"]
+            ),
+            tipo="Caixa",
+            conta_multa=conta_multa,
+            conta_tarifa=conta_tarifa,
+            conta_desconto=conta_desconto,
         )
+    )
 
-        if not extras:
-            _adicionar_linha(
-                linhas,
-                data=data,
-                valor=row["_valor_pagar"],
-                hist=COD_HISTORICO_PAG_CAIXA,
-                complemento=compl,
-                debito=conta_forn,
-                tipo="Caixa",
-            )
-            _adicionar_linha(
-                linhas,
-                data=data,
-                valor=row["_valor_pagar"],
-                hist=COD_HISTORICO_PAG_CAIXA,
-                complemento=compl,
-                credito=CONTA_CAIXA,
-                tipo="Caixa",
-            )
-        else:
-            _adicionar_linha(
-                linhas,
-                data=data,
-                valor=row["_valor_nota"],
-                hist=COD_HISTORICO_PAG_CAIXA,
-                complemento=compl,
-                debito=conta_forn,
-                tipo="Caixa",
-            )
-            if row["_multa"] > 0:
-                _adicionar_linha(
-                    linhas,
-                    data=data,
-                    valor=row["_multa"],
-                    hist=COD_HISTORICO_PAGAMENTO,
-                    complemento=compl,
-                    debito=conta_multa,
-                    tipo="Caixa",
-                )
-            if row["_tarifa"] > 0:
-                _adicionar_linha(
-                    linhas,
-                    data=data,
-                    valor=row["_tarifa"],
-                    hist=COD_HISTORICO_PAGAMENTO,
-                    complemento=compl,
-                    debito=conta_tarifa,
-                    tipo="Caixa",
-                )
-            if row["_desconto"] > 0:
-                _adicionar_linha(
-                    linhas,
-                    data=data,
-                    valor=row["_desconto"],
-                    hist=COD_HISTORICO_PAGAMENTO,
-                    complemento=compl,
-                    credito=conta_desconto,
-                    tipo="Caixa",
-                )
-            _adicionar_linha(
-                linhas,
-                data=data,
-                valor=row["_valor_pagar"] + row["_tarifa"],
-                hist=COD_HISTORICO_PAG_CAIXA,
-                complemento=compl,
-                credito=CONTA_CAIXA,
-                tipo="Caixa",
-            )
+    # ------------------------------------------------------------------
+    # 4) DataFrame final (ordenado por lote e posição no lote)
+    # ------------------------------------------------------------------
+    partes = [p for p in partes if not p.empty]
+    if not partes:
+        return _resultado_vazio()
 
-        _marca_lote(linhas)
+    linhas = pd.concat(partes, ignore_index=True).sort_values(
+        ["_lote", "_seq"], kind="stable", ignore_index=True
+    )
+    if validate:
         _balance_check(linhas)
-        resultado.extend(linhas)
 
-    # ------------------------------------------------------------------
-    # 3) DataFrame final
-    # ------------------------------------------------------------------
-    cols = [
-        "Data",
-        "Cod Conta Débito",
-        "Cod Conta Crédito",
-        "Valor",
-        "Cod Histórico",
-        "Complemento",
-        "Inicia Lote",
-        "_tipo",
-    ]
-    return pd.DataFrame(resultado, columns=cols)
+    return pd.DataFrame(
+        {
+            "Data": linhas["Data"],
+            "Cod Conta Débito": _fmt_conta(linhas["_debito"]),
+            "Cod Conta Crédito": _fmt_conta(linhas["_credito"]),
+            "Valor": _fmt_valor_series(linhas["_valor"]),
+            "Cod Histórico": linhas["Cod Histórico"],
+            "Complemento": linhas["Complemento"],
+            "Inicia Lote": np.where(linhas["_lote"].duplicated(), "", "1"),
+            "_tipo": linhas["_tipo"],
+        },
+        columns=_COLUNAS_RESULTADO,
+        copy=False,
+    ).astype(_DTYPES_TEXTO)
@@ -6,6 +6,8 @@ configuração de logger.
 
 from __future__ import annotations
 
+import functools
+import importlib.util
 import logging
 from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
@@ -15,13 +17,42 @@ import pandas as pd
 
 
 _LOGGER_NAME = "app"
+_CSV_BUFFER = 1 << 20
+
+# Motor de leitura do Excel, resolvido uma vez: ``calamine`` (Rust) quando
+# ``python-calamine`` está instalado, senão ``openpyxl``.
+_EXCEL_ENGINE = (
+    "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
+)
+
+# Colunas do extrato lidas já como ``string``: o valor vem sempre como
+# texto com o sufixo D/C ('123,00D').
+_EXTRATO_DTYPES = {
+    "Histórico": "string",
+    "Valor": "string",
+}
+
+# Colunas de texto da planilha de lançamentos lidas já como ``string``.
+# Os valores monetários ficam de fora: células numéricas devem chegar
+# como números, não como texto ('100.5') para o parser BRL.
+_LANC_DTYPES = {
+    "Nota fiscal": "string",
+    "Nome do fornecedor": "string",
+}
 
 
 def get_logger() -> logging.Logger:
     """Retorna um logger configurado.
 
     O logger grava em ``logs/app.log`` com rotação diária e nível INFO.
+    A configuração roda só na primeira chamada; as demais reutilizam o
+    mesmo objeto.
     """
+    return _make_logger()
+
+
+@functools.lru_cache(maxsize=1)
+def _make_logger() -> logging.Logger:
     logs_dir = Path(__file__).resolve().parents[1] / "logs"
     logs_dir.mkdir(parents=True, exist_ok=True)
 
@@ -42,26 +73,44 @@ def get_logger() -> logging.Logger:
     return logger
 
 
-def _read_excel(path_or_buffer: Any) -> pd.DataFrame:
-    """Lê um arquivo Excel com ``openpyxl``.
+def _excel_file(fonte: Any) -> pd.ExcelFile:
+    """Abre a pasta de trabalho com o motor escolhido na importação."""
+    return pd.ExcelFile(fonte, engine=_EXCEL_ENGINE)
+
+
+def _read_excel(
+    path_or_buffer: Any,
+    dtype: dict[str, str] | None = None,
+    nrows: int | None = None,
+) -> pd.DataFrame:
+    """Lê um arquivo Excel com ``calamine`` (leitor nativo em Rust).
 
     O parâmetro pode ser um ``Path`` ou um objeto de arquivo fornecido
-    pelo ``st.file_uploader`` do Streamlit.
+    pelo ``st.file_uploader`` do Streamlit. ``dtype`` fixa o tipo das
+    colunas indicadas (colunas ausentes na planilha são ignoradas) e
+    ``nrows`` limita a leitura às primeiras linhas (prévias). Sem
+    ``python-calamine`` instalado, cai para o ``openpyxl``.
     """
-    return pd.read_excel(path_or_buffer, engine="openpyxl")
+    with _excel_file(path_or_buffer) as book:
+        return book.parse(dtype=dtype, nrows=nrows)
 
 
-def read_extrato(path: Any) -> pd.DataFrame:
+def read_extrato(path: Any, nrows: int | None = None) -> pd.DataFrame:
     """Lê arquivo de extrato bancário em Excel."""
-    return _read_excel(path)
+    return _read_excel(path, dtype=_EXTRATO_DTYPES, nrows=nrows)
 
 
-def read_lancamentos(path: Any) -> pd.DataFrame:
+def read_lancamentos(path: Any, nrows: int | None = None) -> pd.DataFrame:
     """Lê planilha de lançamentos em Excel."""
-    return _read_excel(path)
+    return _read_excel(path, dtype=_LANC_DTYPES, nrows=nrows)
 
 
 def to_csv_padronizado(df: pd.DataFrame, path: Path) -> None:
-    """Salva ``df`` em CSV usando ``;`` e ``utf-8-sig``."""
+    """Salva ``df`` em CSV usando ``;`` e ``utf-8-sig``.
+
+    O arquivo é aberto com buffer de 1 MiB para gravar em blocos grandes
+    (menos chamadas de ``write`` em disco de rede).
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, sep=";", index=False, encoding="utf-8-sig")
+    with open(path, "wb", buffering=_CSV_BUFFER) as fh:
+        df.to_csv(fh, sep=";", index=False, encoding="utf-8-sig")
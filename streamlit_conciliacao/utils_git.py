@@ -2,10 +2,74 @@
 
 from __future__ import annotations
 
-import json
+import functools
+import hashlib
+import time
+from typing import Any, Dict, Tuple
 
 
-from github import Github
+import orjson
+from github import Github, InputGitTreeElement
+
+# Cache curto de ``get_contents`` por (token, repo, caminho): upserts
+# repetidos do mesmo arquivo não refazem o GET. Toda gravação invalida o
+# caminho (para qualquer token); o cache é limitado a ``_CONTENTS_MAX``.
+_CONTENTS_TTL = 30.0
+_CONTENTS_MAX = 64
+_contents_cache: Dict[Tuple[str, str, str], Tuple[float, Any]] = {}
+
+
+@functools.lru_cache(maxsize=4)
+def _client(token: str) -> Github:
+    """Cliente do GitHub por token (reaproveita a sessão HTTP entre commits)."""
+    return Github(token)
+
+
+def _serializar(data: dict) -> str:
+    return orjson.dumps(
+        data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    ).decode()
+
+
+def _blob_sha(content: str) -> str:
+    """SHA do blob que o Git calcularia para ``content`` (UTF-8)."""
+    payload = content.encode("utf-8")
+    header = b"blob %d\0" % len(payload)
+    return hashlib.sha1(header + payload).hexdigest()
+
+
+def _get_contents(repository: Any, token: str, repo: str, rel_path: str) -> Any:
+    """``repository.get_contents`` com cache de ``_CONTENTS_TTL`` segundos."""
+    key = (token, repo, rel_path)
+    agora = time.monotonic()
+    hit = _contents_cache.get(key)
+    if hit is not None:
+        if agora - hit[0] < _CONTENTS_TTL:
+            return hit[1]
+        del _contents_cache[key]  # expirado
+    existing = repository.get_contents(rel_path)
+    if len(_contents_cache) >= _CONTENTS_MAX:
+        _descartar_antigos(agora)
+    _contents_cache[key] = (agora, existing)
+    return existing
+
+
+def _descartar_antigos(agora: float) -> None:
+    """Remove entradas expiradas; se ainda cheio, a mais antiga."""
+    expiradas = [
+        key
+        for key, (lido_em, _) in _contents_cache.items()
+        if agora - lido_em >= _CONTENTS_TTL
+    ]
+    for key in expiradas:
+        del _contents_cache[key]
+    if len(_contents_cache) >= _CONTENTS_MAX:
+        del _contents_cache[next(iter(_contents_cache))]
+
+
+def _invalidar(repo: str, rel_path: str) -> None:
+    for key in [k for k in _contents_cache if k[1:] == (repo, rel_path)]:
+        del _contents_cache[key]
 
 
 def commit_json(
@@ -17,22 +81,57 @@ def commit_json(
 ) -> None:
     """Cria ou atualiza arquivo JSON em um repositório GitHub.
 
-    A função só executa quando ``token`` e ``repo`` são informados.
+    A função só executa quando ``token`` e ``repo`` são informados. Se o
+    arquivo remoto já tem o mesmo conteúdo, nenhum commit é feito.
     """
     if not token or not repo:
         return
 
-    gh = Github(token)
-    repository = gh.get_repo(repo)
+    repository = _client(token).get_repo(repo)
 
-    content = json.dumps(data, indent=2, ensure_ascii=False)
+    content = _serializar(data)
     try:
-        existing = repository.get_contents(rel_path)
-        repository.update_file(
-            existing.path,
-            msg,
-            content,
-            existing.sha,
-        )
+        existing = _get_contents(repository, token, repo, rel_path)
     except Exception:
         repository.create_file(rel_path, msg, content)
+        return
+
+    if existing.sha == _blob_sha(content):
+        return  # conteúdo idêntico ao do repositório: nada a gravar
+    repository.update_file(
+        existing.path,
+        msg,
+        content,
+        existing.sha,
+    )
+    _invalidar(repo, rel_path)
+
+
+def commit_json_batch(
+    token: str,
+    repo: str,
+    files: Dict[str, dict],
+    msg: str,
+) -> None:
+    """Grava vários arquivos JSON em um único commit no branch padrão.
+
+    Usa a Git Data API (árvore + commit + ref) em vez de uma chamada
+    ``get_contents``/``update_file`` por arquivo, de modo que o número de
+    requisições não cresce com a quantidade de arquivos.
+    """
+    if not token or not repo or not files:
+        return
+
+    repository = _client(token).get_repo(repo)
+
+    ref = repository.get_git_ref(f"heads/{repository.default_branch}")
+    parent = repository.get_git_commit(ref.object.sha)
+    elementos = [
+        InputGitTreeElement(rel_path, "100644", "blob", content=_serializar(data))
+        for rel_path, data in files.items()
+    ]
+    tree = repository.create_git_tree(elementos, base_tree=parent.tree)
+    commit = repository.create_git_commit(msg, tree, [parent])
+    ref.edit(commit.sha)
+    for rel_path in files:
+        _invalidar(repo, rel_path)
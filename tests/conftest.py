@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook
+
+# Permite importar o pacote a partir do repositório local
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _grava_xlsx(path: Path, *linhas: list) -> Path:
+    """Grava as linhas direto com openpyxl (sem o writer do pandas)."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for linha in linhas:
+        ws.append(linha)
+    wb.save(path)
+    return path
+
+
+# ----------------------------------------------------------------------
+# Planilhas de entrada, gravadas uma vez por sessão
+# ----------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def sample_xlsx(tmp_path_factory) -> Path:
+    path = tmp_path_factory.mktemp("xlsx") / "dados.xlsx"
+    return _grava_xlsx(path, ["A", "B"], [1, 3], [2, 4])
+
+
+@pytest.fixture(scope="session")
+def lancamentos_xlsx(tmp_path_factory) -> Path:
+    path = tmp_path_factory.mktemp("xlsx") / "lanc.xlsx"
+    return _grava_xlsx(
+        path, ["Nota fiscal", "Valor"], [123, 100.5], [None, 2.0]
+    )
+
+
+@pytest.fixture(scope="session")
+def valor_misto_xlsx(tmp_path_factory) -> Path:
+    path = tmp_path_factory.mktemp("xlsx") / "misto.xlsx"
+    return _grava_xlsx(path, ["Valor"], [100.5], ["1.234,56"])
@@ -1,8 +1,9 @@
-import sys
-from pathlib import Path
+import os
+from unittest.mock import MagicMock
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from streamlit_conciliacao import app  # noqa: E402
+import pandas as pd
+
+from streamlit_conciliacao import app
 
 
 def test_listar_empresas(tmp_path, monkeypatch):
@@ -15,3 +16,28 @@ def test_listar_empresas(tmp_path, monkeypatch):
     monkeypatch.setattr(app, "DATA_DIR", data_dir)
     empresas = app._listar_empresas()
     assert empresas == {"12345678901234": cfg}
+
+
+def test_carregar_config_recarrega_quando_arquivo_muda(tmp_path):
+    cfg = tmp_path / "contas_config.json"
+    cfg.write_text('{"tarifas": 1}', encoding="utf-8")
+    assert app._carregar_config(cfg)[0] == {"tarifas": 1}
+
+    cfg.write_text('{"tarifas": 2}', encoding="utf-8")
+    mtime = cfg.stat().st_mtime_ns + 1_000_000_000
+    os.utime(cfg, ns=(mtime, mtime))
+    assert app._carregar_config(cfg) == ({"tarifas": 2}, mtime)
+
+
+def test_carregar_config_arquivo_removido(tmp_path, monkeypatch):
+    # Empresa listada (cache de 60 s) cuja pasta já foi apagada
+    logger = MagicMock()
+    monkeypatch.setattr(app, "LOGGER", logger)
+    assert app._carregar_config(tmp_path / "sumiu" / "contas_config.json") == ({}, 0)
+    logger.error.assert_called_once()
+
+
+def test_validar_colunas():
+    df = pd.DataFrame(columns=["Data", "Histórico", "Valor"])
+    assert app._validar_colunas(df, ["Data", "Valor"])
+    assert not app._validar_colunas(df, ["Data", "Nota fiscal"])
@@ -1,10 +1,6 @@
-import sys
-from pathlib import Path
-
 import pytest
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from streamlit_conciliacao import cadastro  # noqa: E402
+from streamlit_conciliacao import cadastro
 
 
 @pytest.fixture(autouse=True)
@@ -51,3 +47,32 @@ def test_erros_validacao():
         cadastro.add_item(cnpj, "invalida", "x", 1)
     with pytest.raises(ValueError):
         cadastro.set_conta_especial(cnpj, "foo", 1)
+
+
+def test_add_items_bulk_grava_uma_vez(monkeypatch):
+    cnpj = "444"
+    cadastro.load_cadastros(cnpj)
+
+    gravacoes = []
+    original = cadastro.save_cadastros
+    monkeypatch.setattr(
+        cadastro,
+        "save_cadastros",
+        lambda c, d: (gravacoes.append(c), original(c, d)),
+    )
+    cadastro.add_items_bulk(cnpj, "fornecedores", {"A": 1, "B": 2, "C": 3})
+
+    assert len(gravacoes) == 1
+    assert cadastro.load_cadastros(cnpj)["fornecedores"] == {"A": 1, "B": 2, "C": 3}
+
+
+def test_edit_cadastros_nao_grava_em_erro():
+    cnpj = "555"
+    cadastro.add_fornecedor(cnpj, "ACME", 10)
+    with pytest.raises(KeyError):
+        cadastro.edit_fornecedor(cnpj, "NAO_EXISTE", 1)
+    with pytest.raises(RuntimeError):
+        with cadastro.edit_cadastros(cnpj) as data:
+            data["fornecedores"]["ACME"] = 99
+            raise RuntimeError
+    assert cadastro.load_cadastros(cnpj)["fornecedores"] == {"ACME": 10}
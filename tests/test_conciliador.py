@@ -1,11 +1,7 @@
-import sys
-from pathlib import Path
-
 import pandas as pd
+import pytest
 
-# Permite importar o pacote a partir do repositório local
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from streamlit_conciliacao import conciliador  # noqa: E402
+from streamlit_conciliacao import conciliador
 
 
 # ----------------------------------------------------------------------
@@ -129,3 +125,182 @@ def test_entrada_cliente():
     assert result.iloc[0]["Cod Conta Débito"] == 7
     assert result.iloc[1]["Cod Conta Crédito"] == 5
     assert result.iloc[0]["Valor"] == "50,00"
+
+
+# ----------------------------------------------------------------------
+# 4) Match múltiplo (mesma data/valor) respeita a ordem da planilha
+# ----------------------------------------------------------------------
+def test_match_multiplo_ordem_planilha():
+    df_extrato = pd.DataFrame(
+        {
+            "Data": ["01/01/2024", "01/01/2024"],
+            "Histórico": ["PAG", "PAG"],
+            "Valor": ["100,00D", "100,00D"],
+        }
+    )
+    df_lanc = pd.DataFrame(
+        {
+            "Data pagamento": ["01/01/2024"] * 3,
+            "Nome do fornecedor": ["ACME", "BETA", "GAMA"],
+            "Nota fiscal": ["1", "2", "3"],
+            "Valor": ["100,00"] * 3,
+            "Descontos": ["0,00"] * 3,
+            "Multa e juros": ["0,00"] * 3,
+            "Valor a pagar": ["100,00"] * 3,
+            "Tarifas de Boleto": ["0,00"] * 3,
+        }
+    )
+    config = {
+        "fornecedores": {"ACME": 10, "BETA": 11, "GAMA": 12},
+        "contas_pagamento": {"Banco": 7},
+    }
+
+    result = conciliador.conciliar(df_extrato, df_lanc, config)
+
+    # Duas saídas casam com ACME e BETA; GAMA vai para caixa
+    assert list(result["_tipo"]) == ["Banco"] * 4 + ["Caixa"] * 2
+    assert list(result["Cod Conta Débito"].iloc[[0, 2, 4]]) == [10, 11, 12]
+    assert list(result["Inicia Lote"]) == ["1", "", "1", "", "1", ""]
+
+
+# ----------------------------------------------------------------------
+# 5) Valores numéricos (células numéricas do Excel) não são re-parseados
+# ----------------------------------------------------------------------
+def test_parse_valor_numerico():
+    serie = pd.Series([100.5, None, 2.0])
+    assert conciliador._parse_valor_series(serie).tolist() == [100.5, 0.0, 2.0]
+
+
+# ----------------------------------------------------------------------
+# 6) Partidas que não fecham: erro por padrão, ignorado com validate=False
+# ----------------------------------------------------------------------
+def test_validate_partidas():
+    df_extrato = pd.DataFrame(columns=["Data", "Histórico", "Valor"])
+    df_lanc = pd.DataFrame(
+        {
+            "Data pagamento": ["01/01/2024"],
+            "Nome do fornecedor": ["ACME"],
+            "Nota fiscal": ["123"],
+            "Valor": ["100,00"],
+            "Descontos": ["0,00"],
+            "Multa e juros": ["5,00"],
+            "Valor a pagar": ["100,00"],  # deveria ser 105,00
+            "Tarifas de Boleto": ["0,00"],
+        }
+    )
+    config = {"fornecedores": {"ACME": 10}, "multas_juros": 50}
+
+    with pytest.raises(ValueError, match="Partidas não fecham"):
+        conciliador.conciliar(df_extrato, df_lanc, config)
+
+    result = conciliador.conciliar(df_extrato, df_lanc, config, validate=False)
+    assert len(result) == 3
+
+
+# ----------------------------------------------------------------------
+# 7) Entradas vazias devolvem o layout de saída sem linhas
+# ----------------------------------------------------------------------
+def test_entradas_vazias():
+    res = conciliador.conciliar(pd.DataFrame(), pd.DataFrame(), {})
+    assert res.empty
+    assert list(res.columns) == conciliador._COLUNAS_RESULTADO
+    # Mesmos tipos das colunas de texto do caso com linhas
+    assert res["Valor"].dtype == "string[pyarrow]"
+
+
+# ----------------------------------------------------------------------
+# 8) Coluna de valores misturando células numéricas e texto BRL
+# ----------------------------------------------------------------------
+def test_parse_valor_coluna_mista():
+    serie = pd.Series([100.5, "1.234,56", None, 7, ""], dtype=object)
+    assert conciliador._parse_valor_series(serie).tolist() == [
+        100.5,
+        1234.56,
+        0.0,
+        7.0,
+        0.0,
+    ]
+
+
+# ----------------------------------------------------------------------
+# 9) Datas: formatos misturados aceitos, data vazia é erro
+# ----------------------------------------------------------------------
+def test_datas_formatos_mistos():
+    datas = pd.Series(["5/1/2024", "06/01/2024 00:00", "07/01/2024"])
+    assert conciliador._fmt_data_series(datas).tolist() == [
+        "05/01/2024",
+        "06/01/2024",
+        "07/01/2024",
+    ]
+
+
+def test_data_vazia_gera_erro():
+    df_extrato = pd.DataFrame(columns=["Data", "Histórico", "Valor"])
+    df_lanc = pd.DataFrame(
+        {
+            "Data pagamento": ["01/01/2024", None],
+            "Nome do fornecedor": ["ACME", "ACME"],
+            "Nota fiscal": ["1", "2"],
+            "Valor": ["10,00", "20,00"],
+            "Descontos": ["0,00", "0,00"],
+            "Multa e juros": ["0,00", "0,00"],
+            "Valor a pagar": ["10,00", "20,00"],
+            "Tarifas de Boleto": ["0,00", "0,00"],
+        }
+    )
+    with pytest.raises(ValueError, match="Data pagamento"):
+        conciliador.conciliar(df_extrato, df_lanc, {})
+
+
+# ----------------------------------------------------------------------
+# 10) Linha do extrato sem valor não gera chave de centavos inválida
+# ----------------------------------------------------------------------
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+def test_extrato_linha_sem_valor():
+    df_extrato = pd.DataFrame(
+        {
+            "Data": ["01/01/2024", "02/01/2024"],
+            "Histórico": ["PAG", ""],
+            "Valor": ["10,00D", None],
+        }
+    )
+    df_lanc = pd.DataFrame(
+        columns=[
+            "Data pagamento",
+            "Nome do fornecedor",
+            "Nota fiscal",
+            "Valor",
+            "Descontos",
+            "Multa e juros",
+            "Valor a pagar",
+            "Tarifas de Boleto",
+        ]
+    )
+    res = conciliador.conciliar(
+        df_extrato, df_lanc, {"contas_pagamento": {"Banco": 7}}
+    )
+    assert res["Valor"].tolist() == ["10,00", "10,00"]
+
+
+# ----------------------------------------------------------------------
+# 11) Extrato vazio (sem colunas): lançamentos vão todos para caixa
+# ----------------------------------------------------------------------
+def test_extrato_vazio_lancamentos_em_caixa():
+    df_lanc = pd.DataFrame(
+        {
+            "Data pagamento": ["01/01/2024"],
+            "Nome do fornecedor": ["ACME"],
+            "Nota fiscal": ["12"],
+            "Valor": ["100,00"],
+            "Descontos": ["0,00"],
+            "Multa e juros": ["0,00"],
+            "Valor a pagar": ["100,00"],
+            "Tarifas de Boleto": ["0,00"],
+        }
+    )
+    res = conciliador.conciliar(
+        pd.DataFrame(), df_lanc, {"fornecedores": {"ACME": 10}}
+    )
+    assert list(res["_tipo"]) == ["Caixa", "Caixa"]
+    assert list(res["Cod Conta Débito"]) == [10, ""]
+    assert list(res["Cod Conta Crédito"]) == ["", conciliador.CONTA_CAIXA]
@@ -1,22 +1,19 @@
-import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import pandas as pd
+import pytest
 
-import pandas as pd  # noqa: E402
-from streamlit_conciliacao import utils  # noqa: E402
-from streamlit_conciliacao import utils_git  # noqa: E402
+from streamlit_conciliacao import conciliador
+from streamlit_conciliacao import utils
+from streamlit_conciliacao import utils_git
 
 
-def test_leitura_e_csv(tmp_path: Path) -> None:
+def test_leitura_e_csv(sample_xlsx: Path, tmp_path: Path) -> None:
     df = pd.DataFrame({"A": [1, 2], "B": [3, 4]})
-    excel_path = tmp_path / "dados.xlsx"
-    with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False)
 
-    df_extrato = utils.read_extrato(excel_path)
-    df_lanc = utils.read_lancamentos(excel_path)
+    df_extrato = utils.read_extrato(sample_xlsx)
+    df_lanc = utils.read_lancamentos(sample_xlsx)
     assert df_extrato.equals(df)
     assert df_lanc.equals(df)
 
@@ -27,28 +24,102 @@ def test_leitura_e_csv(tmp_path: Path) -> None:
     assert ";" in texto
 
 
-def test_commit_json(monkeypatch):
-    repo_mock = MagicMock()
+@pytest.fixture
+def gh_cls(monkeypatch) -> MagicMock:
+    """Substitui a classe ``Github`` e limpa o cache de clientes."""
+    utils_git._client.cache_clear()
+    utils_git._contents_cache.clear()
+    mock = MagicMock()
+    monkeypatch.setattr(utils_git, "Github", mock)
+    return mock
+
+
+def test_commit_json(gh_cls: MagicMock) -> None:
+    repo_mock = gh_cls.return_value.get_repo.return_value
     file_mock = MagicMock(path="p.json", sha="abc")
 
-    github_instance = MagicMock()
-    github_instance.get_repo.return_value = repo_mock
-
-    with patch(
-        "streamlit_conciliacao.utils_git.Github",
-        return_value=github_instance,
-    ) as gh_cls:
-        repo_mock.get_contents.return_value = file_mock
-        utils_git.commit_json("t", "org/repo", "p.json", {"x": 1}, "msg")
-        repo_mock.update_file.assert_called_once()
-        repo_mock.create_file.assert_not_called()
-
-        repo_mock.update_file.reset_mock()
-        repo_mock.create_file.reset_mock()
-        repo_mock.get_contents.side_effect = Exception
-        utils_git.commit_json("t", "org/repo", "p.json", {"x": 1}, "msg")
-        repo_mock.create_file.assert_called_once()
-
-    with patch("streamlit_conciliacao.utils_git.Github") as gh_cls:
-        utils_git.commit_json("", "", "a.json", {}, "msg")
-        gh_cls.assert_not_called()
+    repo_mock.get_contents.return_value = file_mock
+    utils_git.commit_json("t", "org/repo", "p.json", {"x": 1}, "msg")
+    repo_mock.update_file.assert_called_once()
+    repo_mock.create_file.assert_not_called()
+
+    # Conteúdo igual ao remoto (mesmo SHA de blob): não grava
+    repo_mock.update_file.reset_mock()
+    file_mock.sha = utils_git._blob_sha(utils_git._serializar({"x": 1}))
+    utils_git.commit_json("t", "org/repo", "p.json", {"x": 1}, "msg")
+    utils_git.commit_json("t", "org/repo", "p.json", {"x": 1}, "msg")
+    repo_mock.update_file.assert_not_called()
+    # Sem gravação, o segundo upsert reaproveita o get_contents em cache
+    assert repo_mock.get_contents.call_count == 2
+
+    repo_mock.reset_mock()
+    utils_git._contents_cache.clear()  # como se o TTL tivesse expirado
+    repo_mock.get_contents.side_effect = Exception
+    utils_git.commit_json("t", "org/repo", "p.json", {"x": 1}, "msg")
+    repo_mock.create_file.assert_called_once()
+    # O cliente é criado uma vez por token
+    gh_cls.assert_called_once_with("t")
+
+    gh_cls.reset_mock()
+    utils_git.commit_json("", "", "a.json", {}, "msg")
+    gh_cls.assert_not_called()
+
+
+def test_contents_cache_por_token_e_limitado(
+    gh_cls: MagicMock, monkeypatch
+) -> None:
+    repo_mock = gh_cls.return_value.get_repo.return_value
+    sha = utils_git._blob_sha(utils_git._serializar({"x": 1}))
+    repo_mock.get_contents.return_value = MagicMock(path="p.json", sha=sha)
+    relogio = [0.0]
+    monkeypatch.setattr(utils_git.time, "monotonic", lambda: relogio[0])
+    monkeypatch.setattr(utils_git, "_CONTENTS_MAX", 2)
+
+    # Cada token tem sua própria entrada
+    for token in ("a", "b", "a"):
+        utils_git.commit_json(token, "org/repo", "p.json", {"x": 1}, "msg")
+    assert repo_mock.get_contents.call_count == 2
+
+    # Entrada expirada é refeita, não acumulada
+    relogio[0] = utils_git._CONTENTS_TTL + 1
+    utils_git.commit_json("a", "org/repo", "p.json", {"x": 1}, "msg")
+    assert repo_mock.get_contents.call_count == 3
+    assert len(utils_git._contents_cache) == 2
+
+    # Cache cheio: descarta as expiradas antes de inserir
+    utils_git.commit_json("c", "org/repo", "p.json", {"x": 1}, "msg")
+    assert {k[0] for k in utils_git._contents_cache} == {"a", "c"}
+
+
+def test_commit_json_batch_um_commit(gh_cls: MagicMock) -> None:
+    repo_mock = gh_cls.return_value.get_repo.return_value
+    repo_mock.default_branch = "main"
+
+    utils_git.commit_json_batch(
+        "t", "org/repo", {"a.json": {"x": 1}, "b.json": {"y": 2}}, "msg"
+    )
+
+    repo_mock.get_git_ref.assert_called_once_with("heads/main")
+    repo_mock.create_git_tree.assert_called_once()
+    elementos = repo_mock.create_git_tree.call_args.args[0]
+    assert len(elementos) == 2
+    repo_mock.create_git_commit.assert_called_once()
+    ref = repo_mock.get_git_ref.return_value
+    ref.edit.assert_called_once_with(repo_mock.create_git_commit.return_value.sha)
+    repo_mock.update_file.assert_not_called()
+
+
+def test_read_lancamentos_notas_como_texto(lancamentos_xlsx: Path) -> None:
+    lanc = utils.read_lancamentos(lancamentos_xlsx)
+    assert lanc["Nota fiscal"].iloc[0] == "123"
+    assert lanc["Valor"].tolist() == [100.5, 2.0]
+
+    previa = utils.read_lancamentos(lancamentos_xlsx, nrows=1)
+    assert previa["Valor"].tolist() == [100.5]
+
+
+def test_read_lancamentos_valor_misto(valor_misto_xlsx: Path) -> None:
+    # Número e texto na mesma coluna chegam como ``object``
+    lanc = utils.read_lancamentos(valor_misto_xlsx)
+    valores = conciliador._parse_valor_series(lanc["Valor"])
+    assert valores.tolist() == [100.5, 1234.56]